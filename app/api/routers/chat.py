@@ -0,0 +1,50 @@
+import logging
+
+import orjson
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.db.database import Session
+from app.db.models import ChatHistory
+from app.schemas.chat import ChatRequest, ChatResponse
+from app.services.process_chat_service import process_request, stream_request
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def _save_history(user_text: str, response_text: str):
+    async with Session() as session:
+        session.add(ChatHistory(user_text=user_text, response_text=response_text))
+        await session.commit()
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat_endpoint(req: ChatRequest):
+    try:
+        response = await process_request(req)
+    except Exception:
+        logger.exception("chat request failed")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    await _save_history(req.text, response.text)
+    return response
+
+
+async def sse_gen(req: ChatRequest):
+    """Wrap streamed chunks as server-sent events."""
+    full_response = ""
+    async for token in stream_request(req):
+        full_response += token
+        yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+    yield f"data: {orjson.dumps({'done': True}).decode()}\n\n"
+    await _save_history(req.text, full_response)
+
+
+@router.post("/chat/stream")
+async def chat_stream_endpoint(req: ChatRequest):
+    return StreamingResponse(
+        sse_gen(req),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
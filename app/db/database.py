@@ -0,0 +1,26 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///chatbot.db"
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, pool_size=5)
+Session = async_sessionmaker(engine, expire_on_commit=False)
+Base = declarative_base()
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets reads proceed during writes; NORMAL sync is safe with WAL
+    # and avoids an fsync per transaction.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+async def init_db():
+    from app.db import models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, Text
+
+from app.db.database import Base
+
+
+class ChatHistory(Base):
+    __tablename__ = "chat_history"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_text = Column(Text, nullable=False)
+    response_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
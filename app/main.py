@@ -0,0 +1,48 @@
+import logging
+
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:  # optional speedup; fall back to the stdlib loop
+    pass
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+from app.api.routers import chat
+from app.db.database import init_db
+from app.services.alpha_vantage_service import alpha_vantage
+
+logging.basicConfig(level=logging.INFO)
+
+app = FastAPI(title="personal-site-backend", default_response_class=ORJSONResponse)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(chat.router, prefix="/api")
+
+
+@app.on_event("startup")
+async def startup():
+    await init_db()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await alpha_vantage.aclose()
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
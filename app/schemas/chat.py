@@ -0,0 +1,18 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ChatRequest(BaseModel):
+    text: str
+
+
+class Plan(BaseModel):
+    """Structured output schema for the intent planner."""
+
+    intent: Literal["stock_analysis", "market_news", "general_chat"]
+    symbol: str | None = None
+
+
+class ChatResponse(BaseModel):
+    text: str
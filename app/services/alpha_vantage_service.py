@@ -0,0 +1,53 @@
+import os
+
+import httpx
+import orjson
+
+
+class AlphaVantageService:
+    """Wrapper for the AlphaVantage market data API."""
+
+    BASE_URL = "https://www.alphavantage.co/query"
+
+    def __init__(self, api_key: str | None = None, session: httpx.AsyncClient | None = None):
+        self.api_key = api_key or os.getenv("ALPHA_VANTAGE_API_KEY", "")
+        # One pooled client for all AlphaVantage calls: keep-alive
+        # connections avoid paying the TCP+TLS handshake per request, and
+        # HTTP/2 lets concurrent GETs share a single connection.
+        self.session = session or httpx.AsyncClient(
+            http2=True,
+            timeout=15,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    async def request(self, function: str, **params) -> dict:
+        """Issue one API call; raises httpx.HTTPError on transport/4xx/5xx."""
+        params["function"] = function
+        params["apikey"] = self.api_key
+        response = await self.session.get(self.BASE_URL, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def quote(self, symbol: str) -> dict:
+        return await self.request("GLOBAL_QUOTE", symbol=symbol)
+
+    async def overview(self, symbol: str) -> dict:
+        return await self.request("OVERVIEW", symbol=symbol)
+
+    async def time_series_daily(self, symbol: str) -> dict:
+        return await self.request("TIME_SERIES_DAILY", symbol=symbol)
+
+    async def time_series_intraday(self, symbol: str, interval: str = "5min") -> dict:
+        return await self.request(
+            "TIME_SERIES_INTRADAY", symbol=symbol, interval=interval
+        )
+
+    async def news_sentiment(self, tickers: str | None = None) -> dict:
+        params = {"tickers": tickers} if tickers else {}
+        return await self.request("NEWS_SENTIMENT", **params)
+
+
+alpha_vantage = AlphaVantageService()
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import time
+
+
+class GeminiLimiter:
+    """Preemptive rate limiter for Gemini calls.
+
+    Caps in-flight requests with a semaphore and smooths request/token
+    throughput with token buckets refilled continuously against the
+    configured per-minute quotas. Bursts queue here instead of hitting
+    the API, turning into 429s and retry storms.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int | None = None,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+    ):
+        self.max_concurrent = int(
+            max_concurrent or os.getenv("GEMINI_MAX_CONCURRENT", "8")
+        )
+        self.requests_per_minute = int(
+            requests_per_minute or os.getenv("GEMINI_RPM", "60")
+        )
+        self.tokens_per_minute = int(
+            tokens_per_minute or os.getenv("GEMINI_TPM", "120000")
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._request_budget = float(self.requests_per_minute)
+        self._token_budget = float(self.tokens_per_minute)
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_budget = min(
+            float(self.requests_per_minute),
+            self._request_budget + elapsed * self.requests_per_minute / 60,
+        )
+        self._token_budget = min(
+            float(self.tokens_per_minute),
+            self._token_budget + elapsed * self.tokens_per_minute / 60,
+        )
+
+    def _try_acquire(self, predicted_tokens: int) -> float:
+        """Take from the buckets; return 0 on success or seconds to wait.
+
+        No await happens between refill and deduction, so the budget
+        math needs no locking on a single event loop.
+        """
+        self._refill()
+        if self._request_budget >= 1 and self._token_budget >= predicted_tokens:
+            self._request_budget -= 1
+            self._token_budget -= predicted_tokens
+            return 0.0
+        request_wait = (1 - self._request_budget) * 60 / self.requests_per_minute
+        token_wait = (
+            (predicted_tokens - self._token_budget) * 60 / self.tokens_per_minute
+        )
+        return max(request_wait, token_wait, 0.05)
+
+    async def acquire(self, predicted_tokens: int):
+        await self._semaphore.acquire()
+        while (wait := self._try_acquire(predicted_tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def release(self):
+        self._semaphore.release()
@@ -0,0 +1,119 @@
+import logging
+import os
+
+import google.generativeai as genai
+
+from app.services.gemini_limiter import GeminiLimiter
+
+logger = logging.getLogger(__name__)
+
+# Assumed output size when the caller does not cap max_tokens; only used
+# to predict spend for the rate limiter.
+DEFAULT_PREDICTED_OUTPUT = 512
+
+
+class GeminiService:
+    """Thin wrapper around the Gemini API used by the chat pipeline."""
+
+    def __init__(self, model_name: str | None = None):
+        self.model_name = model_name or os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+        self._init_client()
+
+    def _init_client(self):
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        self.limiter = GeminiLimiter()
+        self._model = genai.GenerativeModel(self.model_name)
+        # The app only uses a handful of fixed system prompts, so models
+        # can be built once per prompt and reused across requests.
+        self._system_cache: dict[str, genai.GenerativeModel] = {"": self._model}
+
+    def _get_model(self, system_prompt: str | None) -> genai.GenerativeModel:
+        key = system_prompt or ""
+        model = self._system_cache.get(key)
+        if model is None:
+            model = self._system_cache.setdefault(
+                key,
+                genai.GenerativeModel(
+                    self.model_name, system_instruction=system_prompt
+                ),
+            )
+        return model
+
+    @staticmethod
+    def _predict_tokens(prompt: str, max_tokens: int | None) -> int:
+        return len(prompt) // 4 + (max_tokens or DEFAULT_PREDICTED_OUTPUT)
+
+    @staticmethod
+    def _generation_config(
+        temperature: float, max_tokens: int | None, response_schema=None
+    ) -> genai.GenerationConfig:
+        kwargs = {"temperature": temperature, "max_output_tokens": max_tokens}
+        if response_schema is not None:
+            kwargs["response_mime_type"] = "application/json"
+            kwargs["response_schema"] = response_schema
+        return genai.GenerationConfig(**kwargs)
+
+    @staticmethod
+    def _to_prompt(messages: list[dict]) -> str:
+        return "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+
+    async def achat(
+        self,
+        messages: list[dict],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        response_schema=None,
+    ) -> str:
+        """Generate a reply without blocking the event loop."""
+        model = self._get_model(system_prompt)
+        prompt = self._to_prompt(messages)
+        logger.debug("Gemini prompt=%s", prompt)
+        await self.limiter.acquire(self._predict_tokens(prompt, max_tokens))
+        try:
+            resp = await model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(
+                    temperature, max_tokens, response_schema
+                ),
+            )
+        finally:
+            self.limiter.release()
+        logger.debug("model response =%s", resp.text)
+        return resp.text
+
+    async def stream_chat(
+        self,
+        messages: list[dict],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+    ):
+        """Yield response text chunk by chunk as Gemini generates it."""
+        model = self._get_model(system_prompt)
+        prompt = self._to_prompt(messages)
+        logger.debug("Gemini prompt=%s", prompt)
+        await self.limiter.acquire(self._predict_tokens(prompt, max_tokens))
+        try:
+            stream = await model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(temperature, max_tokens),
+                stream=True,
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            self.limiter.release()
+
+    async def count_tokens_batch(self, texts: list[str]) -> int:
+        """Count tokens across all texts in a single API round-trip.
+
+        The API reports one total for a batch of contents, which is all
+        the budget check needs; callers wanting per-text counts should
+        fall back to a local estimate.
+        """
+        if not texts:
+            return 0
+        result = await self._model.count_tokens_async(list(texts))
+        return result.total_tokens
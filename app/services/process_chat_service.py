@@ -0,0 +1,366 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+
+import httpx
+import orjson
+import redis.asyncio as redis
+
+from app.schemas.chat import ChatRequest, ChatResponse, Plan
+from app.services.alpha_vantage_service import alpha_vantage
+from app.services.gemini_service import GeminiService
+from app.services.semantic_cache import semantic_cache
+
+logger = logging.getLogger(__name__)
+
+MAX_TOKENS = 800
+MAX_NEWS_ITEMS = 5
+GENERAL_RESTRICT_INSTRUCTION_PROMT = (
+    "Only answer questions about finance, markets and this website. "
+    "Politely decline anything else."
+)
+
+_gemini = GeminiService()
+
+_R = redis.from_url(
+    os.getenv("REDIS_URL", "redis://localhost:6379/0"), decode_responses=True
+)
+
+# Per-endpoint TTLs: quotes go stale quickly, company overviews and news
+# feeds barely move inside an hour, and a planner plan for the exact same
+# prompt never changes.
+QUOTE_TTL = 60
+OVERVIEW_TTL = 3600
+NEWS_TTL = 3600
+PLAN_TTL = 3600
+# Long-lived copy served only when the live fetch fails: stale data
+# beats no answer.
+STALE_TTL = 86400
+
+
+def _cache_key(prefix: str, raw: str) -> str:
+    return f"{prefix}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+async def _cache_get(key: str):
+    try:
+        value = await _R.get(key)
+    except redis.RedisError as e:
+        logger.warning("Redis get failed: %s", e)
+        return None
+    return orjson.loads(value) if value is not None else None
+
+
+async def _cache_set(key: str, value, ttl: int):
+    try:
+        await _R.set(key, orjson.dumps(value), ex=ttl)
+    except redis.RedisError as e:
+        logger.warning("Redis set failed: %s", e)
+
+
+# AlphaVantage reports throttling, bad symbols and plan limits as HTTP 200
+# with one of these keys in the body; such payloads must never be cached.
+_AV_SOFT_ERROR_KEYS = ("Note", "Error Message", "Information")
+
+
+def _av_payload_ok(data) -> bool:
+    return isinstance(data, dict) and not any(
+        k in data for k in _AV_SOFT_ERROR_KEYS
+    )
+
+
+async def _fetch_av(
+    function: str, symbol: str | None, ttl: int, tickers: bool = False
+) -> dict | None:
+    """Fetch one AlphaVantage endpoint, serving from Redis when possible."""
+    key = _cache_key("av", f"{function}:{symbol or ''}")
+    if (cached := await _cache_get(key)) is not None:
+        return cached
+
+    params = {}
+    if symbol is not None:
+        params["tickers" if tickers else "symbol"] = symbol
+    try:
+        data = await alpha_vantage.request(function, **params)
+    except httpx.HTTPError as e:
+        logger.warning(
+            "AlphaVantage %s fetch failed, trying stale cache: %s", function, e
+        )
+        return await _cache_get(f"{key}:stale")
+    if not _av_payload_ok(data):
+        logger.warning(
+            "AlphaVantage %s returned a soft error, trying stale cache: %s",
+            function,
+            data,
+        )
+        return await _cache_get(f"{key}:stale")
+    await _cache_set(key, data, ttl)
+    await _cache_set(f"{key}:stale", data, STALE_TTL)
+    return data
+
+# System prompts are static per deployment; building them once at import
+# keeps per-request string work out of the hot path and gives Gemini a
+# stable prefix to cache.
+PLANNER_SYS = (
+    "You are an intent planner for a finance chatbot. "
+    "Classify the user's message into stock_analysis, market_news "
+    "or general_chat, extracting the ticker symbol when present."
+)
+STOCK_ANALYST_SYS = (
+    f"You are a smart stock analyst. Write a concise analysis of the "
+    f"provided data in at most {MAX_TOKENS} tokens. "
+    f"{GENERAL_RESTRICT_INSTRUCTION_PROMT}"
+)
+MARKET_NEWS_SYS = (
+    f"You are a market news reporter. Summarize the given news item "
+    f"in two or three sentences. {GENERAL_RESTRICT_INSTRUCTION_PROMT}"
+)
+GENERAL_SYS = (
+    f"You are a helpful assistant on a personal website. "
+    f"{GENERAL_RESTRICT_INSTRUCTION_PROMT}"
+)
+
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+_TICKER_RE = re.compile(r"\$([A-Za-z]{1,5})\b")
+_NEWS_RE = re.compile(r"\b(?:news|headlines?)\b", re.IGNORECASE)
+
+
+def _plan_from_keywords(text: str) -> dict | None:
+    """Cheap high-confidence classifier; returns None when unsure.
+
+    An explicit $TICKER or a news keyword is unambiguous enough to skip
+    the planner LLM round-trip entirely.
+    """
+    ticker = _TICKER_RE.search(text)
+    if ticker:
+        return {"intent": "stock_analysis", "symbol": ticker.group(1).upper()}
+    if _NEWS_RE.search(text):
+        return {"intent": "market_news", "symbol": None}
+    return None
+
+
+async def get_stock_analysis_data(symbol: str) -> dict | None:
+    results = await asyncio.gather(
+        _fetch_av("GLOBAL_QUOTE", symbol, QUOTE_TTL),
+        _fetch_av("OVERVIEW", symbol, OVERVIEW_TTL),
+        _fetch_av("NEWS_SENTIMENT", symbol, NEWS_TTL, tickers=True),
+        return_exceptions=True,
+    )
+
+    quote_data, overview_data, news_data = results
+
+    # One flaky endpoint must not discard the data the other two
+    # returned; record the failure per source and keep going.
+    consolidated_data = {}
+    if isinstance(quote_data, Exception):
+        logger.error("AlphaVantage quote request failed: %s", quote_data)
+        consolidated_data["quote_error"] = str(quote_data)
+    elif quote_data and "Global Quote" in quote_data:
+        consolidated_data["quote"] = quote_data["Global Quote"]
+
+    if isinstance(overview_data, Exception):
+        logger.error("AlphaVantage overview request failed: %s", overview_data)
+        consolidated_data["overview_error"] = str(overview_data)
+    elif overview_data and "Symbol" in overview_data:
+        consolidated_data["overview"] = overview_data
+
+    if isinstance(news_data, Exception):
+        logger.error("AlphaVantage news request failed: %s", news_data)
+        consolidated_data["news_error"] = str(news_data)
+    elif news_data and "feed" in news_data:
+        consolidated_data["news"] = news_data["feed"][:MAX_NEWS_ITEMS]
+
+    if not any(k in consolidated_data for k in ("quote", "overview", "news")):
+        return None
+    return consolidated_data
+
+
+async def get_market_news_data() -> list | None:
+    data = await _fetch_av("NEWS_SENTIMENT", None, NEWS_TTL)
+    if data and "feed" in data:
+        return data["feed"][:MAX_NEWS_ITEMS]
+    return None
+
+
+async def _make_plan(text: str) -> dict:
+    """Resolve the intent plan: keyword fast path, then Redis, then the
+    planner model."""
+    plan = _plan_from_keywords(text)
+    if plan is not None:
+        return plan
+    plan_key = _cache_key("plan", text)
+    if (plan := await _cache_get(plan_key)) is not None:
+        return plan
+
+    planner_response = await _gemini.achat(
+        [{"role": "user", "content": text}],
+        system_prompt=PLANNER_SYS,
+        temperature=0.0,
+        response_schema=Plan,
+    )
+
+    cleaned_response = _FENCE_RE.sub("", planner_response).strip()
+    try:
+        plan = orjson.loads(cleaned_response)
+    except orjson.JSONDecodeError:
+        # Salvage a JSON object embedded in surrounding prose before
+        # giving up and paying an extra general_chat call.
+        plan = None
+        if match := _JSON_OBJ_RE.search(cleaned_response):
+            try:
+                plan = orjson.loads(match.group(0))
+            except orjson.JSONDecodeError:
+                plan = None
+    if plan is not None:
+        await _cache_set(plan_key, plan, PLAN_TTL)
+        return plan
+    logger.warning("Planner returned non-JSON: %s", planner_response)
+    return {"intent": "general_chat"}
+
+
+async def process_request(req: ChatRequest) -> ChatResponse:
+    if (cached_text := await semantic_cache.get(req.text)) is not None:
+        return ChatResponse(text=cached_text)
+
+    plan = await _make_plan(req.text)
+    intent = plan.get("intent", "general_chat")
+
+    if intent == "stock_analysis" and plan.get("symbol"):
+        stock_data = await get_stock_analysis_data(plan["symbol"])
+        if stock_data is None:
+            return ChatResponse(
+                text="Sorry, I could not fetch market data for that symbol right now."
+            )
+        data_for_prompt = orjson.dumps(
+            stock_data, option=orjson.OPT_INDENT_2
+        ).decode()
+        final_response = await _gemini.achat(
+            [
+                {
+                    "role": "user",
+                    "content": f"Analyze this stock data:\n{data_for_prompt}",
+                }
+            ],
+            system_prompt=STOCK_ANALYST_SYS,
+        )
+        logger.info(
+            "Stock analysis response token count (est.): %s",
+            len(final_response) // 4,
+        )
+        await semantic_cache.set(req.text, final_response)
+        return ChatResponse(text=final_response)
+
+    if intent == "market_news":
+        news_data = await get_market_news_data()
+        logger.debug("Market news data: %s", news_data)
+        if not news_data:
+            return ChatResponse(
+                text="Sorry, I could not fetch market news right now."
+            )
+        final_response = ""
+        final_response_token = 0
+        results = await asyncio.gather(
+            *(
+                _gemini.achat(
+                    [
+                        {
+                            "role": "user",
+                            "content": (
+                                "Summarize this news item: "
+                                f"{orjson.dumps(item).decode()}"
+                            ),
+                        }
+                    ],
+                    system_prompt=MARKET_NEWS_SYS,
+                )
+                for item in news_data
+            )
+        )
+        # One batched round-trip covers the common case where every
+        # summary fits; truncation falls back to local estimates so it
+        # costs no further RPCs.
+        total_tokens = await _gemini.count_tokens_batch(results)
+        if total_tokens <= MAX_TOKENS:
+            final_response = "\n\n".join(results)
+            final_response_token = total_tokens
+        else:
+            for resp in results:
+                resp_token = len(resp) // 4
+                if resp_token + final_response_token > MAX_TOKENS:
+                    break
+                logger.info("News item response token count: %s", resp_token)
+                final_response += resp + "\n\n"
+                final_response_token += resp_token
+        await semantic_cache.set(req.text, final_response.strip())
+        return ChatResponse(text=final_response.strip())
+
+    final_response = await _gemini.achat(
+        [{"role": "user", "content": req.text}],
+        system_prompt=GENERAL_SYS,
+    )
+    await semantic_cache.set(req.text, final_response)
+    return ChatResponse(text=final_response)
+
+
+async def stream_request(req: ChatRequest):
+    """Yield the reply for `req` chunk by chunk instead of buffering it.
+
+    Routing matches /chat: cached answers are yielded as a single chunk,
+    the data intents fetch their AlphaVantage payload first and stream
+    only the final synthesis call.
+    """
+    if (cached_text := await semantic_cache.get(req.text)) is not None:
+        yield cached_text
+        return
+
+    plan = await _make_plan(req.text)
+    intent = plan.get("intent", "general_chat")
+    max_tokens = None
+
+    if intent == "stock_analysis" and plan.get("symbol"):
+        stock_data = await get_stock_analysis_data(plan["symbol"])
+        if stock_data is None:
+            yield "Sorry, I could not fetch market data for that symbol right now."
+            return
+        data_for_prompt = orjson.dumps(
+            stock_data, option=orjson.OPT_INDENT_2
+        ).decode()
+        messages = [
+            {
+                "role": "user",
+                "content": f"Analyze this stock data:\n{data_for_prompt}",
+            }
+        ]
+        system_prompt = STOCK_ANALYST_SYS
+    elif intent == "market_news":
+        news_data = await get_market_news_data()
+        if not news_data:
+            yield "Sorry, I could not fetch market news right now."
+            return
+        messages = [
+            {
+                "role": "user",
+                "content": (
+                    "Summarize each of these news items: "
+                    f"{orjson.dumps(news_data).decode()}"
+                ),
+            }
+        ]
+        system_prompt = MARKET_NEWS_SYS
+        max_tokens = MAX_TOKENS
+    else:
+        messages = [{"role": "user", "content": req.text}]
+        system_prompt = GENERAL_SYS
+
+    full_response = ""
+    async for chunk in _gemini.stream_chat(
+        messages, system_prompt=system_prompt, max_tokens=max_tokens
+    ):
+        full_response += chunk
+        yield chunk
+    if full_response:
+        await semantic_cache.set(req.text, full_response)
@@ -0,0 +1,108 @@
+import hashlib
+import logging
+import os
+import struct
+
+import google.generativeai as genai
+import redis.asyncio as redis
+from redis.commands.search.field import TextField, VectorField
+from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+from redis.commands.search.query import Query
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "models/text-embedding-004")
+EMBEDDING_DIM = 768
+INDEX_NAME = "idx:semantic_cache"
+KEY_PREFIX = "semcache:"
+SIMILARITY_THRESHOLD = 0.95
+CACHE_TTL = 3600
+
+
+class SemanticCache:
+    """Reuse responses for semantically equivalent prompts.
+
+    Prompts are embedded and stored in a RediSearch HNSW index; a new
+    prompt whose nearest neighbour has cosine similarity above the
+    threshold returns the stored response without touching Gemini.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self._r = client
+        self._index_ready = False
+
+    async def _ensure_index(self):
+        if self._index_ready:
+            return
+        try:
+            await self._r.ft(INDEX_NAME).info()
+        except redis.ResponseError:
+            await self._r.ft(INDEX_NAME).create_index(
+                fields=[
+                    TextField("response"),
+                    VectorField(
+                        "embedding",
+                        "HNSW",
+                        {
+                            "TYPE": "FLOAT32",
+                            "DIM": EMBEDDING_DIM,
+                            "DISTANCE_METRIC": "COSINE",
+                        },
+                    ),
+                ],
+                definition=IndexDefinition(
+                    prefix=[KEY_PREFIX], index_type=IndexType.HASH
+                ),
+            )
+        self._index_ready = True
+
+    @staticmethod
+    async def _embed(text: str) -> bytes:
+        result = await genai.embed_content_async(
+            model=EMBEDDING_MODEL, content=text
+        )
+        return struct.pack(f"{EMBEDDING_DIM}f", *result["embedding"])
+
+    async def get(self, text: str) -> str | None:
+        try:
+            await self._ensure_index()
+            query = (
+                Query("*=>[KNN 1 @embedding $vec AS score]")
+                .sort_by("score")
+                .return_fields("response", "score")
+                .dialect(2)
+            )
+            res = await self._r.ft(INDEX_NAME).search(
+                query, query_params={"vec": await self._embed(text)}
+            )
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None
+        if not res.docs:
+            return None
+        doc = res.docs[0]
+        # RediSearch reports cosine *distance*; similarity = 1 - distance.
+        similarity = 1.0 - float(doc.score)
+        if similarity < SIMILARITY_THRESHOLD:
+            return None
+        logger.info("Semantic cache hit (similarity=%.3f)", similarity)
+        response = doc.response
+        return response.decode() if isinstance(response, bytes) else response
+
+    async def set(self, text: str, response: str):
+        try:
+            await self._ensure_index()
+            key = KEY_PREFIX + hashlib.sha256(text.encode()).hexdigest()
+            await self._r.hset(
+                key,
+                mapping={"embedding": await self._embed(text), "response": response},
+            )
+            await self._r.expire(key, CACHE_TTL)
+        except Exception as e:
+            logger.warning("Semantic cache store failed: %s", e)
+
+
+# The vector field is raw bytes, so this client must not decode responses.
+semantic_cache = SemanticCache(
+    redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+)